@@ -5,100 +5,186 @@ A simplified version using SQLite for easy deployment
 Author: Venna Venkata Siva Reddy
 """
 
+import gzip
 import os
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, render_template_string
+from functools import wraps
+from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 import json
+import orjson
+
+# Brotli is optional; without it the demo page is served gzip or identity
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, used by jsonify() and request.get_json()"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response without a str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'demo-secret-key'
+app.json = ORJSONProvider(app)
 
 # Enable CORS
 CORS(app)
 
-# SQLite database setup
-DB_PATH = 'library_demo.db'
+# SQLite database setup: the demo data lives in a shared-cache in-memory
+# database, reachable from every connection in this process. Each process
+# builds its own copy (and its own response caches), so the app must run as
+# exactly one process; scale with threads, not workers
+DB_PATH = 'file:librarymem?mode=memory&cache=shared'
 
-def init_db():
-    """Initialize SQLite database with sample data"""
-    # Remove existing database to start fresh
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
+# The in-memory database is discarded when its last connection closes, so
+# init_db keeps one open for the life of the process
+_db_keeper = None
+
+# Stamped on the database once init_db has built it
+SCHEMA_VERSION = 1
+
+# Per-thread connection cache for the read-only API routes, sharing one page cache
+_local = threading.local()
+
+def get_conn():
+    """Return this thread's SQLite connection, opening it on first use"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, uri=True, check_same_thread=False,
+                               isolation_level=None, cached_statements=256)
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Read connections never write, so they can skip shared-cache read
+        # locks instead of failing while a write route holds a table lock
+        conn.execute("PRAGMA read_uncommitted=1")
+        # Prepare the route queries up front so the first requests hit the
+        # statement cache; the exact text must match, so no LIMIT 0 wrapper
+        for sql in PREPARED_STATEMENTS:
+            conn.execute(sql).close()
+        _local.conn = conn
+    return conn
+
+def fetch_dicts(cursor):
+    """Fetch the remaining rows of cursor as dicts keyed by column name"""
+    cols = [c[0] for c in cursor.description]
+    return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+def json_ok(**kwargs):
+    """Build a successful JSON response directly, bypassing jsonify"""
+    return app.response_class(orjson.dumps({"success": True, **kwargs}),
+                              mimetype='application/json')
+
+def attach_authors(conn, books):
+    """Add author names to each book dict from a flat book_authors scan"""
+    authors_by_book = {}
+    for book_id, name in conn.execute(SQL_BOOK_AUTHORS):
+        authors_by_book.setdefault(book_id, []).append(name)
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    for book in books:
+        names = authors_by_book.get(book["book_id"], [])
+        # Keep the comma-joined string (as GROUP_CONCAT produced) for existing clients
+        book["authors"] = ",".join(names) or None
+        book["author_names"] = names
+
+def compute_stats(conn):
+    """Collect the library statistics served by /api/stats"""
+    # Get various statistics in a single round-trip
+    stats = dict(zip(STATS_KEYS, conn.execute(SQL_STATS).fetchone()))
     
-    # Create tables
-    cursor.executescript('''
-    CREATE TABLE IF NOT EXISTS authors (
-        author_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        first_name VARCHAR(50) NOT NULL,
-        last_name VARCHAR(50) NOT NULL,
-        birth_date DATE,
-        nationality VARCHAR(50),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
+    # Most popular books
+    rows = conn.execute(SQL_POPULAR_BOOKS).fetchall()
+    stats['popular_books'] = [{"title": row[0], "borrow_count": row[1]} for row in rows]
+    
+    # Most active members
+    rows = conn.execute(SQL_ACTIVE_MEMBERS).fetchall()
+    stats['active_members'] = [{"name": row[0], "borrow_count": row[1]} for row in rows]
+    return stats
 
-    CREATE TABLE IF NOT EXISTS categories (
-        category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        category_name VARCHAR(100) UNIQUE NOT NULL,
-        description TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
+# Second-resolution clock: (epoch second, ISO timestamp, /health body),
+# rebuilt only when the second rolls over
+_clock = (0, "", b"")
 
-    CREATE TABLE IF NOT EXISTS books (
-        book_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        isbn VARCHAR(13) UNIQUE NOT NULL,
-        title VARCHAR(200) NOT NULL,
-        publication_year INTEGER,
-        publisher VARCHAR(100),
-        total_copies INTEGER DEFAULT 1,
-        available_copies INTEGER DEFAULT 1,
-        category_id INTEGER,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (category_id) REFERENCES categories(category_id)
-    );
+def _tick():
+    """Return the clock tuple, refreshing it on a new second"""
+    global _clock
+    t = int(time.time())
+    if t != _clock[0]:
+        iso = datetime.fromtimestamp(t).isoformat()
+        _clock = (t, iso, orjson.dumps({"status": "healthy", "timestamp": iso}))
+    return _clock
 
-    CREATE TABLE IF NOT EXISTS book_authors (
-        book_id INTEGER,
-        author_id INTEGER,
-        PRIMARY KEY (book_id, author_id),
-        FOREIGN KEY (book_id) REFERENCES books(book_id),
-        FOREIGN KEY (author_id) REFERENCES authors(author_id)
-    );
+def now_iso():
+    """Current local time as an ISO string, to the second"""
+    return _tick()[1]
 
-    CREATE TABLE IF NOT EXISTS members (
-        member_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        first_name VARCHAR(50) NOT NULL,
-        last_name VARCHAR(50) NOT NULL,
-        email VARCHAR(100) UNIQUE NOT NULL,
-        phone VARCHAR(15),
-        address TEXT,
-        membership_date DATE DEFAULT CURRENT_DATE,
-        status VARCHAR(20) DEFAULT 'active',
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
+# Lifetime of cached bodies that also depend on the clock (overdue counts,
+# generated_at)
+STATS_TTL = 5.0
 
-    CREATE TABLE IF NOT EXISTS borrowings (
-        borrowing_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        member_id INTEGER NOT NULL,
-        book_id INTEGER NOT NULL,
-        borrow_date DATE DEFAULT CURRENT_DATE,
-        due_date DATE,
-        return_date DATE,
-        status VARCHAR(20) DEFAULT 'borrowed',
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (member_id) REFERENCES members(member_id),
-        FOREIGN KEY (book_id) REFERENCES books(book_id)
-    );
-    ''')
-    
-    # Insert sample data
-    cursor.executescript('''
-    INSERT OR IGNORE INTO categories (category_name, description) VALUES
+# Serialized bodies of the cached GET routes: (data version, built at, body)
+_data_version = 0
+_resp_cache = {}
+
+def invalidate_caches():
+    """Drop every cached response after a write"""
+    global _data_version
+    _data_version += 1
+
+# Cache decorator; bodies are kept until the next write, or for at most
+# ttl seconds when given
+def cache_response(ttl=None):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Read the version before querying so a concurrent write forces a rebuild
+            version = _data_version
+            now = time.monotonic()
+            cached = _resp_cache.get(f.__name__)
+            if (cached is not None and cached[0] == version
+                    and (ttl is None or now - cached[1] < ttl)):
+                return app.response_class(cached[2], mimetype='application/json')
+            
+            response = f(*args, **kwargs)
+            _resp_cache[f.__name__] = (version, now, response.get_data())
+            return response
+        return decorated_function
+    return decorator
+
+# Shared-cache table locks are not retried like file locks, so write routes
+# run one at a time
+_write_lock = threading.Lock()
+
+# Write decorator
+def serialize_writes(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            with _write_lock:
+                return f(*args, **kwargs)
+        finally:
+            # Invalidate even on failure; reads skip locks and may have seen
+            # rows that were later rolled back
+            invalidate_caches()
+    return decorated_function
+
+# Sample data seeded by init_db
+SAMPLE_CATEGORIES = (
     ('Technology', 'Books about technology and programming'),
     ('Science', 'Scientific and research books'),
     ('Fiction', 'Fictional literature and novels'),
@@ -106,9 +192,10 @@ def init_db():
     ('History', 'Historical books and biographies'),
     ('Mathematics', 'Mathematics and statistical books'),
     ('Philosophy', 'Philosophy and ethics books'),
-    ('Art', 'Art, design, and creative books');
+    ('Art', 'Art, design, and creative books'),
+)
 
-    INSERT OR IGNORE INTO authors (first_name, last_name, nationality, birth_date) VALUES
+SAMPLE_AUTHORS = (
     ('Robert', 'Martin', 'American', '1952-12-05'),
     ('Eric', 'Evans', 'American', '1962-03-15'),
     ('Martin', 'Fowler', 'British', '1963-12-18'),
@@ -128,41 +215,44 @@ def init_db():
     ('Linus', 'Torvalds', 'Finnish', '1969-12-28'),
     ('Tim', 'Berners-Lee', 'British', '1955-06-08'),
     ('Ada', 'Lovelace', 'British', '1815-12-10'),
-    ('Alan', 'Turing', 'British', '1912-06-23');
+    ('Alan', 'Turing', 'British', '1912-06-23'),
+)
 
-    INSERT OR IGNORE INTO books (isbn, title, publication_year, publisher, total_copies, available_copies, category_id) VALUES
+SAMPLE_BOOKS = (
     ('9780132350884', 'Clean Code: A Handbook of Agile Software Craftsmanship', 2008, 'Prentice Hall', 5, 3, 1),
     ('9780321125217', 'Domain-Driven Design: Tackling Complexity in the Heart of Software', 2003, 'Addison-Wesley', 3, 2, 1),
     ('9780201633610', 'Design Patterns: Elements of Reusable Object-Oriented Software', 1994, 'Addison-Wesley', 4, 4, 1),
     ('9780134685991', 'Effective Java', 2017, 'Addison-Wesley', 6, 5, 1),
-    ('9780596007126', 'Head First Design Patterns', 2004, 'O''Reilly Media', 4, 3, 1),
+    ('9780596007126', 'Head First Design Patterns', 2004, "O'Reilly Media", 4, 3, 1),
     ('9780735619678', 'Code Complete: A Practical Handbook of Software Construction', 2004, 'Microsoft Press', 3, 2, 1),
     ('9780201616224', 'The Pragmatic Programmer: From Journeyman to Master', 1999, 'Addison-Wesley', 5, 4, 1),
     ('9780201835953', 'The Mythical Man-Month: Essays on Software Engineering', 1995, 'Addison-Wesley', 2, 1, 1),
     ('9780201896831', 'The Art of Computer Programming, Volume 1', 1997, 'Addison-Wesley', 2, 2, 6),
     ('9780321563842', 'The C++ Programming Language', 2013, 'Addison-Wesley', 4, 3, 1),
-    ('9780596009205', 'Head First Java', 2005, 'O''Reilly Media', 6, 4, 1),
+    ('9780596009205', 'Head First Java', 2005, "O'Reilly Media", 6, 4, 1),
     ('9780134052786', 'Java: The Complete Reference', 2020, 'McGraw-Hill', 3, 2, 1),
     ('9780135166307', 'Refactoring: Improving the Design of Existing Code', 2018, 'Addison-Wesley', 3, 3, 1),
-    ('9780134494166', 'Clean Architecture: A Craftsman''s Guide to Software Structure', 2017, 'Prentice Hall', 4, 2, 1),
+    ('9780134494166', "Clean Architecture: A Craftsman's Guide to Software Structure", 2017, 'Prentice Hall', 4, 2, 1),
     ('9780321127426', 'Patterns of Enterprise Application Architecture', 2002, 'Addison-Wesley', 2, 1, 1),
     ('9780062315007', 'The Lean Startup', 2011, 'Crown Business', 3, 2, 4),
     ('9780307887894', 'The Hard Thing About Hard Things', 2014, 'Harper Business', 2, 1, 4),
-    ('9781119278962', 'Building Microservices: Designing Fine-Grained Systems', 2021, 'O''Reilly Media', 3, 2, 1),
-    ('9781492032526', 'Designing Data-Intensive Applications', 2017, 'O''Reilly Media', 4, 3, 1),
+    ('9781119278962', 'Building Microservices: Designing Fine-Grained Systems', 2021, "O'Reilly Media", 3, 2, 1),
+    ('9781492032526', 'Designing Data-Intensive Applications', 2017, "O'Reilly Media", 4, 3, 1),
     ('9780316769174', 'The Catcher in the Rye', 1951, 'Little, Brown', 5, 4, 3),
     ('9780062316097', 'Sapiens: A Brief History of Humankind', 2014, 'Harper', 4, 3, 5),
     ('9780345816023', 'The Name of the Wind', 2007, 'DAW Books', 3, 2, 3),
     ('9780553573404', 'A Brief History of Time', 1988, 'Bantam', 3, 2, 2),
     ('9780486411095', 'Flatland: A Romance of Many Dimensions', 1884, 'Dover Publications', 2, 2, 6),
-    ('9780674022966', 'Justice: What''s the Right Thing to Do?', 2009, 'Harvard University Press', 2, 1, 7);
+    ('9780674022966', "Justice: What's the Right Thing to Do?", 2009, 'Harvard University Press', 2, 1, 7),
+)
 
-    INSERT OR IGNORE INTO book_authors (book_id, author_id) VALUES
+SAMPLE_BOOK_AUTHORS = (
     (1, 1), (2, 2), (3, 4), (3, 5), (3, 6), (3, 7), (4, 8), (5, 9), (5, 10),
-    (6, 11), (7, 12), (7, 13), (8, 14), (9, 15), (10, 16), (11, 9), (11, 10),
-    (12, 8), (13, 3), (14, 1), (15, 3), (16, 2), (17, 2), (18, 3), (19, 3);
+    (6, 11), (7, 12), (7, 13), (8, 14), (9, 15), (10, 16), (11, 9), (11, 10), (12, 8),
+    (13, 3), (14, 1), (15, 3), (16, 2), (17, 2), (18, 3), (19, 3),
+)
 
-    INSERT OR IGNORE INTO members (first_name, last_name, email, phone, address, membership_date, status) VALUES
+SAMPLE_MEMBERS = (
     ('John', 'Doe', 'john.doe@email.com', '+1-555-0101', '123 Main St', '2024-01-15', 'active'),
     ('Jane', 'Smith', 'jane.smith@email.com', '+1-555-0102', '456 Oak Ave', '2024-02-20', 'active'),
     ('Mike', 'Johnson', 'mike.j@email.com', '+1-555-0103', '789 Pine Rd', '2024-03-10', 'active'),
@@ -177,19 +267,20 @@ def init_db():
     ('Jessica', 'Anderson', 'jessica.a@email.com', '+1-555-0112', '468 Ash Rd', '2024-02-14', 'active'),
     ('Kevin', 'Thomas', 'kevin.thomas@email.com', '+1-555-0113', '913 Walnut Ave', '2024-03-25', 'active'),
     ('Michelle', 'White', 'michelle.w@email.com', '+1-555-0114', '357 Cherry St', '2024-04-18', 'active'),
-    ('Alex', 'Lee', 'alex.lee@email.com', '+1-555-0115', '682 Sycamore Dr', '2024-05-22', 'active');
-
-    INSERT OR IGNORE INTO borrowings (member_id, book_id, borrow_date, due_date, return_date, status) VALUES
-    (1, 1, '2025-06-01', '2025-07-01', NULL, 'borrowed'),
-    (2, 2, '2025-06-15', '2025-07-15', NULL, 'borrowed'),
-    (3, 3, '2025-06-20', '2025-07-20', NULL, 'borrowed'),
-    (4, 5, '2025-06-25', '2025-07-25', NULL, 'borrowed'),
-    (5, 7, '2025-07-01', '2025-08-01', NULL, 'borrowed'),
-    (6, 11, '2025-07-02', '2025-08-02', NULL, 'borrowed'),
-    (7, 13, '2025-07-03', '2025-08-03', NULL, 'borrowed'),
-    (8, 16, '2025-07-04', '2025-08-04', NULL, 'borrowed'),
-    (9, 19, '2025-07-05', '2025-08-05', NULL, 'borrowed'),
-    (10, 21, '2025-07-06', '2025-08-06', NULL, 'borrowed'),
+    ('Alex', 'Lee', 'alex.lee@email.com', '+1-555-0115', '682 Sycamore Dr', '2024-05-22', 'active'),
+)
+
+SAMPLE_BORROWINGS = (
+    (1, 1, '2025-06-01', '2025-07-01', None, 'borrowed'),
+    (2, 2, '2025-06-15', '2025-07-15', None, 'borrowed'),
+    (3, 3, '2025-06-20', '2025-07-20', None, 'borrowed'),
+    (4, 5, '2025-06-25', '2025-07-25', None, 'borrowed'),
+    (5, 7, '2025-07-01', '2025-08-01', None, 'borrowed'),
+    (6, 11, '2025-07-02', '2025-08-02', None, 'borrowed'),
+    (7, 13, '2025-07-03', '2025-08-03', None, 'borrowed'),
+    (8, 16, '2025-07-04', '2025-08-04', None, 'borrowed'),
+    (9, 19, '2025-07-05', '2025-08-05', None, 'borrowed'),
+    (10, 21, '2025-07-06', '2025-08-06', None, 'borrowed'),
     (1, 4, '2025-05-01', '2025-06-01', '2025-05-28', 'returned'),
     (2, 6, '2025-05-10', '2025-06-10', '2025-06-08', 'returned'),
     (3, 8, '2025-05-15', '2025-06-15', '2025-06-12', 'returned'),
@@ -199,11 +290,127 @@ def init_db():
     (7, 15, '2025-03-15', '2025-04-15', '2025-04-10', 'returned'),
     (8, 17, '2025-03-20', '2025-04-20', '2025-04-15', 'returned'),
     (9, 18, '2025-03-25', '2025-04-25', '2025-04-20', 'returned'),
-    (10, 20, '2025-02-10', '2025-03-10', '2025-03-05', 'returned');
+    (10, 20, '2025-02-10', '2025-03-10', '2025-03-05', 'returned'),
+)
+
+def init_db():
+    """Initialize the in-memory SQLite database with sample data"""
+    global _db_keeper
+    
+    # Nothing to do if this process has already built the database
+    conn = sqlite3.connect(DB_PATH, uri=True, check_same_thread=False)
+    if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        conn.close()
+        return
+    
+    cursor = conn.cursor()
+    
+    # Create tables
+    cursor.executescript('''
+    CREATE TABLE IF NOT EXISTS authors (
+        author_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        birth_date DATE,
+        nationality VARCHAR(50),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS categories (
+        category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category_name VARCHAR(100) UNIQUE NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS books (
+        book_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        isbn VARCHAR(13) UNIQUE NOT NULL,
+        title VARCHAR(200) NOT NULL,
+        publication_year INTEGER,
+        publisher VARCHAR(100),
+        total_copies INTEGER DEFAULT 1,
+        available_copies INTEGER DEFAULT 1,
+        category_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (category_id) REFERENCES categories(category_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS book_authors (
+        book_id INTEGER,
+        author_id INTEGER,
+        PRIMARY KEY (book_id, author_id),
+        FOREIGN KEY (book_id) REFERENCES books(book_id),
+        FOREIGN KEY (author_id) REFERENCES authors(author_id)
+    );
+
+    CREATE TABLE IF NOT EXISTS members (
+        member_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        phone VARCHAR(15),
+        address TEXT,
+        membership_date DATE DEFAULT CURRENT_DATE,
+        status VARCHAR(20) DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS borrowings (
+        borrowing_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_id INTEGER NOT NULL,
+        book_id INTEGER NOT NULL,
+        borrow_date DATE DEFAULT CURRENT_DATE,
+        due_date DATE,
+        return_date DATE,
+        status VARCHAR(20) DEFAULT 'borrowed',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (member_id) REFERENCES members(member_id),
+        FOREIGN KEY (book_id) REFERENCES books(book_id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_ba_author ON book_authors(author_id, book_id);
+    CREATE INDEX IF NOT EXISTS idx_borrowings_member ON borrowings(member_id);
+    CREATE INDEX IF NOT EXISTS idx_borrowings_book ON borrowings(book_id);
+    CREATE INDEX IF NOT EXISTS idx_books_title ON books(title);
+    CREATE INDEX IF NOT EXISTS idx_books_category ON books(category_id);
+    CREATE INDEX IF NOT EXISTS idx_members_active ON members(status) WHERE status = 'active';
+    CREATE INDEX IF NOT EXISTS idx_borrowings_borrowed ON borrowings(status, due_date) WHERE status = 'borrowed';
     ''')
     
+    # Insert sample data in a single transaction
+    with conn:
+        cursor.executemany(
+            "INSERT OR IGNORE INTO categories (category_name, description) VALUES (?, ?)",
+            SAMPLE_CATEGORIES
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO authors (first_name, last_name, nationality, birth_date) VALUES (?, ?, ?, ?)",
+            SAMPLE_AUTHORS
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO books (isbn, title, publication_year, publisher, total_copies, available_copies, category_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            SAMPLE_BOOKS
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO book_authors (book_id, author_id) VALUES (?, ?)",
+            SAMPLE_BOOK_AUTHORS
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO members (first_name, last_name, email, phone, address, membership_date, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            SAMPLE_MEMBERS
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO borrowings (member_id, book_id, borrow_date, due_date, return_date, status) VALUES (?, ?, ?, ?, ?, ?)",
+            SAMPLE_BORROWINGS
+        )
+    
+    # Collect statistics so the planner uses the indexes above
+    cursor.execute("ANALYZE")
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
     conn.commit()
-    conn.close()
+    _db_keeper = conn
 
 # HTML template for the demo interface
 DEMO_TEMPLATE = '''
@@ -551,6 +758,14 @@ DEMO_TEMPLATE = '''
                 <button class="try-button" onclick="tryEndpoint('/api/stats')">Try It</button>
                 <div id="result-stats" class="result-box" style="display:none;"></div>
             </div>
+
+            <div class="api-endpoint">
+                <span class="method">GET</span>
+                <span class="endpoint">/api/bootstrap</span>
+                <div class="description">Get stats, books, authors, members and borrowings in one call</div>
+                <button class="try-button" onclick="tryEndpoint('/api/bootstrap')">Try It</button>
+                <div id="result-bootstrap" class="result-box" style="display:none;"></div>
+            </div>
         </div>
 
         <div class="demo-section">
@@ -572,6 +787,31 @@ DEMO_TEMPLATE = '''
     </div>
 
     <script>
+        // Read data fetched in a single round-trip by boot()
+        let BOOT = null;
+        const BOOT_KEYS = {
+            '/api/books': 'books',
+            '/api/authors': 'authors',
+            '/api/members': 'members',
+            '/api/borrowings': 'borrowings'
+        };
+
+        async function boot() {
+            const response = await fetch('/api/bootstrap');
+            BOOT = await response.json();
+        }
+
+        // Rebuild an endpoint's response from the bootstrap data, if it has it
+        function bootResult(endpoint) {
+            if (!BOOT) return null;
+            if (endpoint === '/api/stats') {
+                return { success: true, stats: BOOT.stats, generated_at: BOOT.generated_at };
+            }
+            const key = BOOT_KEYS[endpoint];
+            if (!key) return null;
+            return { success: true, count: BOOT[key].length, [key]: BOOT[key] };
+        }
+
         async function tryEndpoint(endpoint) {
             const resultId = 'result-' + endpoint.split('/').pop();
             const resultBox = document.getElementById(resultId);
@@ -580,8 +820,11 @@ DEMO_TEMPLATE = '''
             resultBox.textContent = 'Loading...';
             
             try {
-                const response = await fetch(endpoint);
-                const data = await response.json();
+                let data = bootResult(endpoint);
+                if (!data) {
+                    const response = await fetch(endpoint);
+                    data = await response.json();
+                }
                 resultBox.textContent = JSON.stringify(data, null, 2);
             } catch (error) {
                 resultBox.textContent = 'Error: ' + error.message;
@@ -703,9 +946,9 @@ DEMO_TEMPLATE = '''
 
         async function loadStats() {
             try {
-                const response = await fetch('/api/stats');
-                const data = await response.json();
-                const stats = data.stats;
+                // Refreshes the cached endpoint data too, so Try It stays current after writes
+                await boot();
+                const stats = BOOT.stats;
                 
                 const statsGrid = document.getElementById('stats-grid');
                 statsGrid.innerHTML = `
@@ -754,268 +997,246 @@ DEMO_TEMPLATE = '''
 </html>
 '''
 
+# The demo page has no template variables, so encode it once and skip Jinja
+DEMO_HTML = DEMO_TEMPLATE.encode('utf-8')
+DEMO_GZ = gzip.compress(DEMO_HTML, 9)
+DEMO_BR = brotli.compress(DEMO_HTML, quality=11) if BROTLI_AVAILABLE else None
+
+# Read queries, kept as constants so each connection's statement cache hits
+SQL_BOOKS = '''
+    SELECT b.*, c.category_name
+    FROM books b
+    LEFT JOIN categories c ON b.category_id = c.category_id
+    ORDER BY b.title
+'''
+
+SQL_AVAILABLE_BOOKS = '''
+    SELECT b.*, c.category_name
+    FROM books b
+    LEFT JOIN categories c ON b.category_id = c.category_id
+    WHERE b.available_copies > 0
+    ORDER BY b.title
+'''
+
+SQL_BOOK_AUTHORS = '''
+    SELECT ba.book_id, a.first_name || ' ' || a.last_name
+    FROM book_authors ba
+    JOIN authors a ON ba.author_id = a.author_id
+    ORDER BY ba.book_id, ba.author_id
+'''
+
+SQL_AUTHORS = '''
+    SELECT a.*, COUNT(ba.book_id) as book_count
+    FROM authors a
+    LEFT JOIN book_authors ba ON a.author_id = ba.author_id
+    GROUP BY a.author_id
+    ORDER BY a.last_name, a.first_name
+'''
+
+SQL_CATEGORIES = '''
+    SELECT c.*, COUNT(b.book_id) as book_count
+    FROM categories c
+    LEFT JOIN books b ON c.category_id = b.category_id
+    GROUP BY c.category_id
+    ORDER BY c.category_name
+'''
+
+SQL_MEMBERS = '''
+    SELECT m.*, COUNT(br.borrowing_id) as total_borrowings
+    FROM members m
+    LEFT JOIN borrowings br ON m.member_id = br.member_id
+    GROUP BY m.member_id
+    ORDER BY m.last_name, m.first_name
+'''
+
+SQL_BORROWINGS = '''
+    SELECT br.*, 
+           m.first_name || ' ' || m.last_name as member_name,
+           b.title as book_title,
+           b.isbn
+    FROM borrowings br
+    JOIN members m ON br.member_id = m.member_id
+    JOIN books b ON br.book_id = b.book_id
+    ORDER BY br.borrow_date DESC
+'''
+
+SQL_OVERDUE_BORROWINGS = '''
+    SELECT br.*, 
+           m.first_name || ' ' || m.last_name as member_name,
+           m.email as member_email,
+           b.title as book_title,
+           b.isbn,
+           JULIANDAY('now') - JULIANDAY(br.due_date) as days_overdue
+    FROM borrowings br
+    JOIN members m ON br.member_id = m.member_id
+    JOIN books b ON br.book_id = b.book_id
+    WHERE br.status = 'borrowed' AND br.due_date < DATE('now')
+    ORDER BY br.due_date
+'''
+
+STATS_KEYS = (
+    'total_books', 'total_authors', 'total_members', 'active_borrowings',
+    'total_copies', 'available_copies', 'total_categories',
+    'overdue_borrowings', 'total_returns',
+)
+
+SQL_STATS = '''
+    SELECT (SELECT COUNT(*) FROM books),
+           (SELECT COUNT(*) FROM authors),
+           (SELECT COUNT(*) FROM members WHERE status = 'active'),
+           (SELECT COUNT(*) FROM borrowings WHERE status = 'borrowed'),
+           (SELECT COALESCE(SUM(total_copies), 0) FROM books),
+           (SELECT COALESCE(SUM(available_copies), 0) FROM books),
+           (SELECT COUNT(*) FROM categories),
+           (SELECT COUNT(*) FROM borrowings WHERE status = 'borrowed' AND due_date < DATE('now')),
+           (SELECT COUNT(*) FROM borrowings WHERE status = 'returned')
+'''
+
+SQL_POPULAR_BOOKS = '''
+    SELECT b.title, COUNT(br.borrowing_id) as borrow_count
+    FROM books b
+    JOIN borrowings br ON b.book_id = br.book_id
+    GROUP BY b.book_id
+    ORDER BY borrow_count DESC
+    LIMIT 5
+'''
+
+SQL_ACTIVE_MEMBERS = '''
+    SELECT m.first_name || ' ' || m.last_name as name, COUNT(br.borrowing_id) as borrow_count
+    FROM members m
+    JOIN borrowings br ON m.member_id = br.member_id
+    GROUP BY m.member_id
+    ORDER BY borrow_count DESC
+    LIMIT 5
+'''
+
+# Statements prepared when each read connection is opened
+PREPARED_STATEMENTS = (
+    SQL_BOOKS, SQL_AVAILABLE_BOOKS, SQL_BOOK_AUTHORS, SQL_AUTHORS,
+    SQL_CATEGORIES, SQL_MEMBERS, SQL_BORROWINGS, SQL_OVERDUE_BORROWINGS,
+    SQL_STATS, SQL_POPULAR_BOOKS, SQL_ACTIVE_MEMBERS,
+)
+
 @app.route('/')
 def demo_home():
     """Demo homepage with interactive interface"""
-    return render_template_string(DEMO_TEMPLATE)
+    accepted = request.accept_encodings
+    if DEMO_BR is not None and accepted['br']:
+        body, encoding = DEMO_BR, 'br'
+    elif accepted['gzip']:
+        body, encoding = DEMO_GZ, 'gzip'
+    else:
+        body, encoding = DEMO_HTML, None
+    
+    response = app.response_class(body, mimetype='text/html')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route('/health')
 def health_check():
     """Health check endpoint for deployment"""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return app.response_class(_tick()[2], mimetype='application/json')
 
 @app.route('/api/books')
+@cache_response()
 def get_books():
     """Get all books with author information"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT b.*, c.category_name,
-               GROUP_CONCAT(a.first_name || ' ' || a.last_name) as authors
-        FROM books b
-        LEFT JOIN categories c ON b.category_id = c.category_id
-        LEFT JOIN book_authors ba ON b.book_id = ba.book_id
-        LEFT JOIN authors a ON ba.author_id = a.author_id
-        GROUP BY b.book_id
-        ORDER BY b.title
-    ''')
-    
-    books = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    conn = get_conn()
+    books = fetch_dicts(conn.execute(SQL_BOOKS))
+    attach_authors(conn, books)
     
-    return jsonify({
-        "success": True,
-        "count": len(books),
-        "books": books
-    })
+    return json_ok(count=len(books), books=books)
 
 @app.route('/api/books/available')
+@cache_response()
 def get_available_books():
     """Get only available books"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT b.*, c.category_name,
-               GROUP_CONCAT(a.first_name || ' ' || a.last_name) as authors
-        FROM books b
-        LEFT JOIN categories c ON b.category_id = c.category_id
-        LEFT JOIN book_authors ba ON b.book_id = ba.book_id
-        LEFT JOIN authors a ON ba.author_id = a.author_id
-        WHERE b.available_copies > 0
-        GROUP BY b.book_id
-        ORDER BY b.title
-    ''')
-    
-    books = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    conn = get_conn()
+    books = fetch_dicts(conn.execute(SQL_AVAILABLE_BOOKS))
+    attach_authors(conn, books)
     
-    return jsonify({
-        "success": True,
-        "count": len(books),
-        "books": books
-    })
+    return json_ok(count=len(books), books=books)
 
 @app.route('/api/authors')
+@cache_response()
 def get_authors():
     """Get all authors with book count"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT a.*, COUNT(ba.book_id) as book_count
-        FROM authors a
-        LEFT JOIN book_authors ba ON a.author_id = ba.author_id
-        GROUP BY a.author_id
-        ORDER BY a.last_name, a.first_name
-    ''')
-    
-    authors = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    conn = get_conn()
+    authors = fetch_dicts(conn.execute(SQL_AUTHORS))
     
-    return jsonify({
-        "success": True,
-        "count": len(authors),
-        "authors": authors
-    })
+    return json_ok(count=len(authors), authors=authors)
 
 @app.route('/api/categories')
+@cache_response()
 def get_categories():
     """Get all categories with book counts"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT c.*, COUNT(b.book_id) as book_count
-        FROM categories c
-        LEFT JOIN books b ON c.category_id = b.category_id
-        GROUP BY c.category_id
-        ORDER BY c.category_name
-    ''')
-    
-    categories = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    conn = get_conn()
+    categories = fetch_dicts(conn.execute(SQL_CATEGORIES))
     
-    return jsonify({
-        "success": True,
-        "count": len(categories),
-        "categories": categories
-    })
+    return json_ok(count=len(categories), categories=categories)
 
 @app.route('/api/members')
+@cache_response()
 def get_members():
     """Get all library members"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT m.*, COUNT(br.borrowing_id) as total_borrowings
-        FROM members m
-        LEFT JOIN borrowings br ON m.member_id = br.member_id
-        GROUP BY m.member_id
-        ORDER BY m.last_name, m.first_name
-    ''')
+    conn = get_conn()
+    members = fetch_dicts(conn.execute(SQL_MEMBERS))
     
-    members = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    
-    return jsonify({
-        "success": True,
-        "count": len(members),
-        "members": members
-    })
+    return json_ok(count=len(members), members=members)
 
 @app.route('/api/borrowings')
+@cache_response()
 def get_borrowings():
     """Get all borrowings with member and book details"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT br.*, 
-               m.first_name || ' ' || m.last_name as member_name,
-               b.title as book_title,
-               b.isbn
-        FROM borrowings br
-        JOIN members m ON br.member_id = m.member_id
-        JOIN books b ON br.book_id = b.book_id
-        ORDER BY br.borrow_date DESC
-    ''')
+    conn = get_conn()
+    borrowings = fetch_dicts(conn.execute(SQL_BORROWINGS))
     
-    borrowings = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    
-    return jsonify({
-        "success": True,
-        "count": len(borrowings),
-        "borrowings": borrowings
-    })
+    return json_ok(count=len(borrowings), borrowings=borrowings)
 
 @app.route('/api/borrowings/overdue')
 def get_overdue_borrowings():
     """Get overdue borrowings"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT br.*, 
-               m.first_name || ' ' || m.last_name as member_name,
-               m.email as member_email,
-               b.title as book_title,
-               b.isbn,
-               JULIANDAY('now') - JULIANDAY(br.due_date) as days_overdue
-        FROM borrowings br
-        JOIN members m ON br.member_id = m.member_id
-        JOIN books b ON br.book_id = b.book_id
-        WHERE br.status = 'borrowed' AND br.due_date < DATE('now')
-        ORDER BY br.due_date
-    ''')
+    conn = get_conn()
+    overdue = fetch_dicts(conn.execute(SQL_OVERDUE_BORROWINGS))
     
-    overdue = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    
-    return jsonify({
-        "success": True,
-        "count": len(overdue),
-        "overdue_borrowings": overdue
-    })
+    return json_ok(count=len(overdue), overdue_borrowings=overdue)
 
 @app.route('/api/stats')
+@cache_response(STATS_TTL)
 def get_stats():
     """Get comprehensive library statistics"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Get various statistics
-    stats = {}
-    
-    cursor.execute("SELECT COUNT(*) FROM books")
-    stats['total_books'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM authors")
-    stats['total_authors'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM members WHERE status = 'active'")
-    stats['total_members'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM borrowings WHERE status = 'borrowed'")
-    stats['active_borrowings'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT SUM(total_copies) FROM books")
-    stats['total_copies'] = cursor.fetchone()[0] or 0
-    
-    cursor.execute("SELECT SUM(available_copies) FROM books")
-    stats['available_copies'] = cursor.fetchone()[0] or 0
-    
-    cursor.execute("SELECT COUNT(*) FROM categories")
-    stats['total_categories'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM borrowings WHERE status = 'borrowed' AND due_date < DATE('now')")
-    stats['overdue_borrowings'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM borrowings WHERE status = 'returned'")
-    stats['total_returns'] = cursor.fetchone()[0]
-    
-    # Most popular books
-    cursor.execute('''
-        SELECT b.title, COUNT(br.borrowing_id) as borrow_count
-        FROM books b
-        JOIN borrowings br ON b.book_id = br.book_id
-        GROUP BY b.book_id
-        ORDER BY borrow_count DESC
-        LIMIT 5
-    ''')
-    stats['popular_books'] = [{"title": row[0], "borrow_count": row[1]} for row in cursor.fetchall()]
-    
-    # Most active members
-    cursor.execute('''
-        SELECT m.first_name || ' ' || m.last_name as name, COUNT(br.borrowing_id) as borrow_count
-        FROM members m
-        JOIN borrowings br ON m.member_id = br.member_id
-        GROUP BY m.member_id
-        ORDER BY borrow_count DESC
-        LIMIT 5
-    ''')
-    stats['active_members'] = [{"name": row[0], "borrow_count": row[1]} for row in cursor.fetchall()]
-    
-    conn.close()
+    stats = compute_stats(get_conn())
+    return json_ok(stats=stats, generated_at=now_iso())
+
+@app.route('/api/bootstrap')
+@cache_response(STATS_TTL)
+def get_bootstrap():
+    """Get stats plus all books, authors, members and borrowings in one response"""
+    conn = get_conn()
+    # read_uncommitted connections get no snapshot from a transaction, so hold
+    # off writes instead to keep the sections consistent with each other
+    with _write_lock:
+        stats = compute_stats(conn)
+        books = fetch_dicts(conn.execute(SQL_BOOKS))
+        attach_authors(conn, books)
+        authors = fetch_dicts(conn.execute(SQL_AUTHORS))
+        members = fetch_dicts(conn.execute(SQL_MEMBERS))
+        borrowings = fetch_dicts(conn.execute(SQL_BORROWINGS))
     
-    return jsonify({
-        "success": True,
-        "stats": stats,
-        "generated_at": datetime.now().isoformat()
-    })
+    return json_ok(
+        stats=stats,
+        books=books,
+        authors=authors,
+        members=members,
+        borrowings=borrowings,
+        generated_at=now_iso()
+    )
 
 # DML Operations - Create, Update, Delete
 @app.route('/api/members', methods=['POST'])
+@serialize_writes
 def create_member():
     """Create a new library member"""
     try:
@@ -1030,7 +1251,7 @@ def create_member():
                     "error": f"Missing required field: {field}"
                 }), 400
         
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, uri=True)
         cursor = conn.cursor()
         
         # Check if email already exists
@@ -1072,12 +1293,13 @@ def create_member():
         }), 500
 
 @app.route('/api/members/<int:member_id>', methods=['PUT'])
+@serialize_writes
 def update_member(member_id):
     """Update an existing member"""
     try:
         data = request.get_json()
         
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, uri=True)
         cursor = conn.cursor()
         
         # Check if member exists
@@ -1123,6 +1345,7 @@ def update_member(member_id):
         }), 500
 
 @app.route('/api/borrowings', methods=['POST'])
+@serialize_writes
 def create_borrowing():
     """Create a new book borrowing"""
     try:
@@ -1137,7 +1360,7 @@ def create_borrowing():
                     "error": f"Missing required field: {field}"
                 }), 400
         
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, uri=True)
         cursor = conn.cursor()
         
         # Check if book is available
@@ -1199,10 +1422,11 @@ def create_borrowing():
         }), 500
 
 @app.route('/api/borrowings/<int:borrowing_id>/return', methods=['PUT'])
+@serialize_writes
 def return_book(borrowing_id):
     """Return a borrowed book"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, uri=True)
         cursor = conn.cursor()
         
         # Check if borrowing exists and is active
@@ -1255,6 +1479,7 @@ def return_book(borrowing_id):
         }), 500
 
 @app.route('/api/books', methods=['POST'])
+@serialize_writes
 def create_book():
     """Add a new book to the library"""
     try:
@@ -1269,7 +1494,7 @@ def create_book():
                     "error": f"Missing required field: {field}"
                 }), 400
         
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, uri=True)
         cursor = conn.cursor()
         
         # Check if ISBN already exists
@@ -1312,10 +1537,11 @@ def create_book():
         }), 500
 
 @app.route('/api/members/<int:member_id>', methods=['DELETE'])
+@serialize_writes
 def delete_member(member_id):
     """Delete a member (only if no active borrowings)"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(DB_PATH, uri=True)
         cursor = conn.cursor()
         
         # Check if member exists
@@ -1356,10 +1582,11 @@ def delete_member(member_id):
             "error": str(e)
         }), 500
 
+# Build the database at import so every server (gunicorn, Vercel, __main__)
+# starts with the sample data
+init_db()
+
 if __name__ == '__main__':
-    # Initialize database on startup
-    init_db()
-    
     # Run the app
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)